@@ -13,4 +13,8 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'erail.settings')
 
+# The views are I/O-bound, so uvloop's faster event loop helps. ASGI servers
+# create their loop before importing this module, so choose it on the server:
+#   uvicorn erail.asgi:application --loop uvloop
+# (uvicorn's default --loop auto already picks uvloop when it's installed.)
 application = get_asgi_application()
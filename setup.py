@@ -0,0 +1,17 @@
+# Installs the erail project and the train_api app, and builds the optional
+# Cython parser used by train_api.utils. For a development checkout:
+#   pip install -e .   (or: python setup.py build_ext --inplace)
+from setuptools import find_packages, setup
+from Cython.Build import cythonize
+
+setup(
+    name="indian-rail-api",
+    packages=find_packages(include=["erail", "train_api", "train_api.*"]),
+    install_requires=[
+        "django",
+        "httpx[http2,brotli]", # http2=True needs h2; brotli for br responses
+        "orjson",
+        "selectolax",
+    ],
+    ext_modules=cythonize("train_api/_fastparse.pyx", language_level=3),
+)
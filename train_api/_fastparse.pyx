@@ -0,0 +1,97 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+# train_api/_fastparse.pyx
+# Optional C implementation of the between_station_logic train loop.
+# Build with `python setup.py build_ext --inplace`; utils falls back to the
+# pure-Python parser when this module isn't compiled.
+from cpython.bytes cimport PyBytes_AS_STRING, PyBytes_GET_SIZE
+from cpython.unicode cimport PyUnicode_DecodeUTF8
+
+# Same field names (and order) as utils.between_station_logic
+_FIELD_NAMES = (
+    "train_no", "train_name",
+    "source_stn_name", "source_stn_code",
+    "dstn_stn_name", "dstn_stn_code",
+    "from_stn_name", "from_stn_code",
+    "to_stn_name", "to_stn_code",
+    "from_time", "to_time", "travel_time",
+)
+
+cdef inline str _decode(const char *p, Py_ssize_t start, Py_ssize_t end):
+    return PyUnicode_DecodeUTF8(p + start, end - start, "surrogatepass")
+
+cdef object _parse_record(const char *p, Py_ssize_t start, Py_ssize_t end):
+    # Split p[start:end] on "~", skipping empty fields; None if < 14 fields
+    cdef Py_ssize_t starts[14]
+    cdef Py_ssize_t ends[14]
+    cdef Py_ssize_t i = start, field_start = start
+    cdef int count = 0
+    cdef int k
+    while i <= end and count < 14:
+        if i == end or p[i] == b'~':
+            if i > field_start:
+                starts[count] = field_start
+                ends[count] = i
+                count += 1
+            field_start = i + 1
+        i += 1
+    if count < 14:
+        return None
+
+    obj = {}
+    for k in range(13):
+        obj[_FIELD_NAMES[k]] = _decode(p, starts[k], ends[k])
+    raw_running_days = _decode(p, starts[13], ends[13])
+    obj["running_days_str"] = raw_running_days
+    if len(raw_running_days) == 7:
+        obj["running_days"] = [1 if c == "Y" else 0 for c in raw_running_days]
+    else:
+        obj["running_days"] = []
+    return {"train_base": obj}
+
+cdef object _parse_segment(const char *p, Py_ssize_t start, Py_ssize_t end):
+    # A train record is the text after the segment's only "~^"
+    cdef Py_ssize_t i, record_start = -1
+    for i in range(start, end - 1):
+        if p[i] == b'~' and p[i + 1] == b'^':
+            if record_start >= 0:
+                return None
+            record_start = i + 2
+    if record_start < 0:
+        return None
+    return _parse_record(p, record_start, end)
+
+def parse_between_stations(str text):
+    """
+    Returns (trains, saw_segment) for an erail getTrains response, matching
+    the pure-Python path in utils.between_station_logic (_iter_trains).
+    """
+    cdef bytes blob = text.encode("utf-8", "surrogatepass")
+    cdef const char *p = PyBytes_AS_STRING(blob)
+    cdef Py_ssize_t n = PyBytes_GET_SIZE(blob)
+    cdef Py_ssize_t i, seg_start = 0, seg_end
+    cdef int tilde_run = 0
+    cdef bint saw_segment = False
+    trains = []
+
+    # Walk the buffer once, splitting on "~~~~~~~~" the way str.split does
+    # (leftmost, non-overlapping) and handling each non-empty segment
+    for i in range(n + 1):
+        if i < n:
+            if p[i] != b'~':
+                tilde_run = 0
+                continue
+            tilde_run += 1
+            if tilde_run < 8:
+                continue
+            tilde_run = 0
+            seg_end = i - 7
+        else:
+            seg_end = n
+        if seg_end > seg_start:
+            saw_segment = True
+            train = _parse_segment(p, seg_start, seg_end)
+            if train is not None:
+                trains.append(train)
+        seg_start = i + 1
+
+    return trains, saw_segment
@@ -1,3 +1,229 @@
-from django.test import TestCase
+import asyncio
+import random
+import unittest
+from unittest import mock
 
-# Create your tests here.
+import httpx
+from django.test import AsyncClient, SimpleTestCase
+
+from . import utils, views
+
+try:
+    from ._fastparse import parse_between_stations
+except ImportError:
+    parse_between_stations = None
+
+
+# What the pure-Python path of utils.between_station_logic produces
+def _python_parse_between_stations(text):
+    segments = text.split(utils._SEP_BIG)
+    return list(utils._iter_trains(filter(None, segments))), any(segments)
+
+def _random_record(rng):
+    tokens = ["12345", "RAJDHANI EXP", "NDLS", "NEW DELHI", "16:00", "é"] * 4 + ["", "^"]
+    fields = [rng.choice(tokens) for _ in range(rng.randint(12, 17))]
+    if rng.random() < 0.7 and len(fields) > 13:
+        fields[13] = "".join(rng.choice("YN") for _ in range(rng.choice([6, 7, 7, 8])))
+    return rng.choice(["", "x", "~", "a~b"]) + "~^" + "~".join(fields)
+
+def _random_response(rng):
+    if rng.random() < 0.3: # Unstructured noise
+        pieces = ["~", "~^", "~~~~~~~~", "~~~~~~~", "Y", "N", "12345", "NDLS", "", "é", "\U0001F686"]
+        return "".join(rng.choice(pieces) for _ in range(rng.randint(0, 60)))
+    return "~~~~~~~~".join(_random_record(rng) for _ in range(rng.randint(0, 6)))
+
+
+@unittest.skipIf(parse_between_stations is None, "train_api._fastparse is not built")
+class FastParseTests(SimpleTestCase):
+    # _fastparse duplicates the field names and running_days handling of
+    # utils._iter_trains; these keep the two from drifting apart
+
+    def test_well_formed_response(self):
+        text = "~~~~~~~~".join([
+            "header",
+            "~^12345~RAJDHANI EXP~NEW DELHI~NDLS~MUMBAI~MMCT~NEW DELHI~NDLS~MUMBAI~MMCT~16:00~08:00~16.00~YNYNYNY~x",
+            "~^22222~DURONTO~HOWRAH~HWH~PUNE~PUNE~HOWRAH~HWH~PUNE~PUNE~06:00~10:00~28.00~YYYY",
+        ])
+        trains, saw_segment = parse_between_stations(text)
+        self.assertTrue(saw_segment)
+        self.assertEqual([t["train_base"]["train_no"] for t in trains], ["12345", "22222"])
+        self.assertEqual(trains[0]["train_base"]["running_days"], [1, 0, 1, 0, 1, 0, 1])
+        self.assertEqual(trains[1]["train_base"]["running_days"], [])
+        self.assertEqual((trains, saw_segment), _python_parse_between_stations(text))
+
+    def test_matches_python_parser(self):
+        rng = random.Random(2712)
+        for _ in range(5000):
+            text = _random_response(rng)
+            self.assertEqual(parse_between_stations(text), _python_parse_between_stations(text), text)
+
+
+# Upstream bodies in erail's tilde format
+_TRAIN_DETAILS = ("^12345~RAJDHANI EXP~NEW DELHI~NDLS~MUMBAI~MMCT~a~b~c~d~16:00~08:00~16.00~YNYNYNY~e~f"
+                  "~~~~~~~~" + "~".join(str(i) for i in range(25))) # train_id (field 12) is "12"
+_BETWEEN = "~~~~~~~~".join([
+    "header",
+    "~^12345~RAJDHANI EXP~NEW DELHI~NDLS~MUMBAI~MMCT~NEW DELHI~NDLS~MUMBAI~MMCT~16:00~08:00~16.00~YNYNYNY~x",
+    "~^22222~DURONTO~HOWRAH~HWH~PUNE~PUNE~HOWRAH~HWH~PUNE~PUNE~06:00~10:00~28.00~YYYYYYY~a",
+])
+
+def _route(code):
+    return "~^" + "~".join(["1", code, "STATION", "10:00", "10:05", "x", "0", "1", "y", "NR"])
+
+
+class ViewTests(SimpleTestCase):
+    # Every upstream request goes through an httpx.MockTransport; self.upstream
+    # maps a substring of the URL to the response, checked in order
+
+    def setUp(self):
+        self.upstream = []
+        self.requested = []
+        transport = httpx.MockTransport(self._handle)
+        patcher = mock.patch.object(views, "_new_client", lambda: httpx.AsyncClient(transport=transport))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(views._upstream_cache.clear)
+        self.addCleanup(views._negative_cache.clear)
+        self.addCleanup(views._train_ids.clear)
+        for logic in (utils.between_station_logic, utils.check_train_logic,
+                      utils.get_route_logic, utils.pnr_status_logic):
+            self.addCleanup(logic.cache_clear)
+
+    async def _handle(self, request):
+        url = str(request.url)
+        self.requested.append(url)
+        for fragment, response in self.upstream:
+            if fragment in url:
+                if isinstance(response, Exception):
+                    raise response
+                if callable(response): # Coroutine function producing the response
+                    return await response()
+                return response
+        return httpx.Response(404)
+
+    def test_bad_parameters(self):
+        cases = [
+            ("getTrain", "", "error", "trainNo parameter is required"),
+            ("getTrain", "trainNo=12a45", "error", "trainNo must be a 4 or 5 digit train number"),
+            ("getRoute", "trainNo=123", "error", "trainNo must be a 4 or 5 digit train number"),
+            ("betweenStations", "from=NDLS", "error", "Both from and to parameters are required"),
+            ("betweenStations", "from=NDLS&to=M1", "error", "from and to must be station codes"),
+            ("getTrainOn", "from=NDLS&to=MMCT", "data", "Parameters 'from', 'to', and 'date' are required."),
+            ("getTrainOn", "from=ND1&to=MMCT&date=25-12-2023", "data",
+             "Parameters 'from' and 'to' must be station codes."),
+            ("getTrainOn", "from=NDLS&to=MMCT&date=1-1-2023", "data", "Invalid date format. Please use DD-MM-YYYY."),
+            ("getTrainOn", "from=NDLS&to=MMCT&date=31-02-2023", "data", "Invalid date format. Please use DD-MM-YYYY."),
+            ("stationLive", "", "error", "code parameter (station code) is required"),
+            ("stationLive", "code=ND%26X", "error", "code must be a station code"),
+            ("pnrstatus", "pnr=123", "error", "pnr must be a 10 digit PNR number"),
+        ]
+        for endpoint, query, key, message in cases:
+            with self.subTest(endpoint=endpoint, query=query):
+                response = self.client.get(f"/api/train/{endpoint}?{query}")
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json(), {"success": False, key: message})
+        self.assertEqual(self.requested, [])
+
+    def test_station_codes_are_normalized(self):
+        self.upstream = [("Station_From=R&Station_To=MMCT", httpx.Response(200, text=_BETWEEN))]
+        response = self.client.get("/api/train/betweenStations?from=r&to=%20mmct%20")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["data"]), 2)
+
+    def test_upstream_http_error_is_passed_through(self):
+        self.upstream = [("TrainNo=12345", httpx.Response(503, text="down"))]
+        response = self.client.get("/api/train/getTrain?trainNo=12345")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json(), {"success": False, "error": "HTTP error: 503 - down"})
+
+    def test_upstream_request_error(self):
+        self.upstream = [("TrainNo=12345", httpx.ConnectError("refused"))]
+        response = self.client.get("/api/train/getTrain?trainNo=12345")
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.json(), {"success": False, "error": "Request failed: refused"})
+
+    def test_get_train(self):
+        self.upstream = [("TrainNo=12345", httpx.Response(200, text=_TRAIN_DETAILS))]
+        data = self.client.get("/api/train/getTrain?trainNo=12345").json()
+        self.assertTrue(data["success"])
+        self.assertEqual(data["data"]["train_no"], "12345")
+        self.assertEqual(data["data"]["train_id"], "12")
+
+    def test_get_train_on_filters_by_running_day(self):
+        self.upstream = [("Station_From=NDLS&Station_To=MMCT", httpx.Response(200, text=_BETWEEN))]
+        # 25-12-2023 is a Monday, running_days index 5: "N" for 12345, "Y" for 22222
+        data = self.client.get("/api/train/getTrainOn?from=NDLS&to=MMCT&date=25-12-2023").json()
+        self.assertTrue(data["success"])
+        self.assertEqual([t["train_base"]["train_no"] for t in data["data"]], ["22222"])
+        # 26-12-2023 is a Tuesday, index 6: both run
+        data = self.client.get("/api/train/getTrainOn?from=NDLS&to=MMCT&date=26-12-2023").json()
+        self.assertEqual([t["train_base"]["train_no"] for t in data["data"]], ["12345", "22222"])
+
+    def test_get_route_falls_back_when_speculation_misses(self):
+        self.upstream = [
+            ("TrainNo=12345", httpx.Response(200, text=_TRAIN_DETAILS)),
+            ("Data1=12345&", httpx.Response(200, text=_route("WRONG"))),
+            ("Data1=12&", httpx.Response(200, text=_route("RIGHT"))),
+        ]
+        data = self.client.get("/api/train/getRoute?trainNo=12345").json()
+        self.assertTrue(data["success"])
+        self.assertEqual(data["data"][0]["source_stn_code"], "RIGHT")
+        self.assertEqual(sum("Data1=12&" in url for url in self.requested), 1)
+
+        # The train_id is remembered, so the next lookup speculates correctly
+        self.requested.clear()
+        data = self.client.get("/api/train/getRoute?trainNo=12345").json()
+        self.assertEqual(data["data"][0]["source_stn_code"], "RIGHT")
+        self.assertEqual([url for url in self.requested if "TRAINROUTE" in url],
+                         [views._route_url("12")])
+
+    async def test_get_route_cancels_a_wrong_speculation(self):
+        # Under ASGI, where the shared client and in-flight map are used
+        self.addCleanup(setattr, views, "_client", None)
+        completed = []
+
+        async def slow_wrong_route():
+            await asyncio.sleep(0.2)
+            completed.append(True)
+            return httpx.Response(200, text=_route("WRONG"))
+
+        self.upstream = [
+            ("TrainNo=12345", httpx.Response(200, text=_TRAIN_DETAILS)),
+            ("Data1=12345&", slow_wrong_route),
+            ("Data1=12&", httpx.Response(200, text=_route("RIGHT"))),
+        ]
+        response = await AsyncClient().get("/api/train/getRoute?trainNo=12345")
+        self.assertEqual(response.json()["data"][0]["source_stn_code"], "RIGHT")
+        await asyncio.sleep(0.3) # Long enough for an uncancelled request to finish
+        self.assertEqual(completed, [])
+
+    def test_not_found_is_cached(self):
+        self.upstream = [("TrainNo=99999", httpx.Response(200, text="~~~~~Train not found"))]
+        for _ in range(3):
+            data = self.client.get("/api/train/getRoute?trainNo=99999").json()
+            self.assertEqual(data["data"], "Train not found")
+        # Only the first call goes upstream (the speculative route fetch
+        # included); the repeats are answered from the negative cache
+        self.assertEqual(sum("TrainNo=99999" in url for url in self.requested), 1)
+        self.assertLessEqual(sum("TRAINROUTE" in url for url in self.requested), 1)
+
+    def test_transient_error_is_not_cached(self):
+        self.upstream = [("TrainNo=12345", httpx.Response(200, text="~~~~~Please try again after some time."))]
+        data = self.client.get("/api/train/getTrain?trainNo=12345").json()
+        self.assertEqual(data["data"], "Please try again after some time.")
+        self.upstream = [("TrainNo=12345", httpx.Response(200, text=_TRAIN_DETAILS))]
+        data = self.client.get("/api/train/getTrain?trainNo=12345").json()
+        self.assertTrue(data["success"])
+
+    def test_pnr_status(self):
+        self.upstream = [("pnr-status/1234567890", httpx.Response(200, text='<script>data = {"pnr": "1234567890"};</script>'))]
+        data = self.client.get("/api/train/pnrstatus?pnr=1234567890").json()
+        self.assertEqual(data["data"], {"pnr": "1234567890"})
+
+    def test_station_live(self):
+        html = ('<table><tr><td><div class="name">12345 RAJ</div><div>A → B</div></td>'
+                '<td>16:00 Arrived</td></tr></table>')
+        self.upstream = [("station-live/NDLS", httpx.Response(200, text=html))]
+        data = self.client.get("/api/train/stationLive?code=ndls").json()
+        self.assertEqual(data["data"], [{"train_no": "12345", "train_name": "RAJ", "source_stn_name": "A",
+                                         "dstn_stn_name": "B", "time_at": "16:00", "detail": "Arrived"}])
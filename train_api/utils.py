@@ -1,18 +1,193 @@
 # train_api/utils.py
 import time
-import json
 import re
-from datetime import datetime
-from bs4 import BeautifulSoup # For LiveStation
+import functools
+import hashlib
+import itertools
+import logging
+import threading
+import orjson
+from collections import OrderedDict
+from datetime import date
+from selectolax.lexbor import LexborHTMLParser # For LiveStation
+
+logger = logging.getLogger(__name__)
+
+try: # Optional compiled parser, see setup.py
+    from ._fastparse import parse_between_stations as _fast_parse_between_stations
+except ImportError:
+    _fast_parse_between_stations = None
+
+# Separators used by erail's tilde-delimited responses
+_SEP_BIG = "~~~~~~~~"   # Between top-level segments
+_SEP_TRAIN = "~^"       # Before each train/route record
+_SEP_FIELD = "~"        # Between fields of a record
+
+# Whole-segment error responses (first segment after splitting on _SEP_BIG)
+_BETWEEN_STATION_ERRORS = frozenset([
+    "~~~~~Please try again after some time.",
+    "~~~~~From station not found",
+    "~~~~~To station not found",
+])
+_CHECK_TRAIN_ERRORS = frozenset([
+    "~~~~~Please try again after some time.",
+    "~~~~~Train not found",
+])
+
+# Error results that are a definitive answer about the query itself (the
+# train or station doesn't exist), as opposed to erail being busy or a page
+# that couldn't be parsed; only these are worth remembering
+_NOT_FOUND_ERRORS = frozenset([
+    "Train not found",
+    "From station not found",
+    "To station not found",
+    "No direct trains found",
+])
+
+# Byte table for running_days: 'Y' -> 1, anything else -> 0
+_YN_TABLE = bytes(1 if b == ord("Y") else 0 for b in range(256))
+
+# JS: var pattern = /data\s*=\s*({.*?;})/
+_PNR_RE = re.compile(r"data\s*=\s*({.*?});", re.DOTALL) # re.DOTALL in case JSON spans newlines
 
 # Helper to get current timestamp in milliseconds
 def _current_timestamp_ms():
-    return int(time.time() * 1000)
+    return time.time_ns() // 1_000_000
+
+# Memoize a pure parser on its raw response text. Entries are keyed by a
+# 128-bit digest of the text, so the cache doesn't keep whole upstream pages
+# alive, and hold an orjson blob so every caller gets its own fresh dict.
+# time_stamp is refreshed on every call. Parsers may run in worker threads,
+# hence the lock.
+_PARSE_CACHE_SIZE = 2048
+
+def _cached_parse(func):
+    cache = OrderedDict() # digest -> blob, most recently used last
+    lock = threading.Lock()
+
+    @functools.wraps(func)
+    def wrapper(text: str):
+        key = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        with lock:
+            blob = cache.get(key)
+            if blob is not None:
+                cache.move_to_end(key)
+        if blob is not None:
+            result = orjson.loads(blob)
+            result["time_stamp"] = _current_timestamp_ms()
+            return result
+
+        result = func(text)
+        blob = orjson.dumps(result)
+        with lock:
+            cache[key] = blob
+            if len(cache) > _PARSE_CACHE_SIZE:
+                cache.popitem(last=False)
+        return result
+
+    wrapper.cache_clear = cache.clear
+    return wrapper
+
+# True for a failed result that will come back the same until erail's data
+# changes, i.e. one that is safe to cache
+def is_not_found(result: dict) -> bool:
+    return result.get("success") is False and result.get("data") in _NOT_FOUND_ERRORS
+
+# Helper to pull the `data = {...};` JSON blob out of the PNR page.
+# Tries a plain find() scan first and only falls back to _PNR_RE when the
+# first "data" occurrence isn't the assignment we're after.
+def _extract_pnr_json(html_string: str):
+    i = html_string.find("data")
+    if i >= 0:
+        j = html_string.find("{", i)
+        if j >= 0 and html_string[i + 4:j].strip() == "=":
+            k = html_string.find("};", j)
+            if k >= 0:
+                return html_string[j:k + 1]
+    match = _PNR_RE.search(html_string)
+    return match.group(1) if match else None
+
+# Helper to parse a running_days string "YNNYYNY" into [1,0,0,1,1,0,1].
+# translate() does the per-character mapping in C; anything that isn't a
+# standard 7-day string yields [].
+def _parse_running_days(raw: str):
+    if len(raw) != 7:
+        return []
+    return list(raw.encode("latin-1", "replace").translate(_YN_TABLE))
+
+# Helpers for walking a selectolax tree the way BeautifulSoup's
+# find_next_sibling(tag) / find_parent(tag) did
+def _next_sibling(node, tag: str):
+    node = node.next
+    while node is not None and node.tag != tag:
+        node = node.next
+    return node
+
+def _ancestor(node, tag: str):
+    node = node.parent
+    while node is not None and node.tag != tag:
+        node = node.parent
+    return node
+
+# Helper to split a record into its non-empty tilde-separated fields
+def _split_tilde(s: str):
+    return list(filter(None, s.split(_SEP_FIELD)))
+
+# Same as _split_tilde, but returns None for rows with fewer than min_len fields.
+# min_len fields need at least min_len - 1 separators, so count() (a single
+# scan, no allocation) rejects short rows before anything is split.
+def _parse_row(s: str, min_len: int):
+    if s.count(_SEP_FIELD) < min_len - 1:
+        return None
+    row = _split_tilde(s)
+    return row if len(row) >= min_len else None
+
+# Pure-Python train loop for between_station_logic; yields {"train_base": ...}
+# for every segment that holds a complete train record
+def _iter_trains(data_segments):
+    for segment in data_segments:
+        # A train record is the text after the segment's only "~^"
+        _, sep_train, train_data_str = segment.partition(_SEP_TRAIN)
+        if sep_train and _SEP_TRAIN not in train_data_str:
+            train_details = _parse_row(train_data_str, 14) # Ensure enough data points
+
+            if train_details is not None:
+                (train_no, train_name, source_stn_name, source_stn_code,
+                 dstn_stn_name, dstn_stn_code, from_stn_name, from_stn_code,
+                 to_stn_name, to_stn_code, from_time, to_time, travel_time,
+                 raw_running_days) = train_details[:14]
+
+                # Parse running_days string "YNNYYNY" into [1,0,0,1,1,0,1]
+                # Assuming Y=1, N=0. The order depends on erail's convention (e.g., Mon-Sun or Sun-Sat)
+                # The JS getDayOnDate output suggests an indexing that might match this.
+                # Example: Monday to Sunday
+                parsed_running_days = _parse_running_days(raw_running_days)
 
+                obj = {
+                    "train_no": train_no,
+                    "train_name": train_name,
+                    "source_stn_name": source_stn_name,
+                    "source_stn_code": source_stn_code,
+                    "dstn_stn_name": dstn_stn_name,
+                    "dstn_stn_code": dstn_stn_code,
+                    "from_stn_name": from_stn_name,
+                    "from_stn_code": from_stn_code,
+                    "to_stn_name": to_stn_name,
+                    "to_stn_code": to_stn_code,
+                    "from_time": from_time,
+                    "to_time": to_time,
+                    "travel_time": travel_time,
+                    "running_days_str": raw_running_days, # Keep original string
+                    "running_days": parsed_running_days, # Parsed list
+                }
+
+                yield {"train_base": obj}
+
+@_cached_parse
 def between_station_logic(api_response_text: str):
+    time_stamp = _current_timestamp_ms() # One timestamp per response
     try:
         retval = {}
-        arr = []
         
         # Initial check for specific error messages
         # Note: In JS, data[0] was checked. Here, we check the beginning of the string after splitting.
@@ -20,17 +195,22 @@ def between_station_logic(api_response_text: str):
         # is a bit convoluted if it's just for the "No direct trains" message.
         # Let's simplify the error checking based on the provided JS logic.
 
-        if "No direct trains found" in api_response_text: # Simplified check
-            first_part_for_no_direct = api_response_text.split("~~~~~~~~")[0]
+        # partition() stops at the first separator, so the error checks below
+        # don't pay for splitting the whole response
+        first_segment, sep, rest = api_response_text.partition(_SEP_BIG)
+
+        # The message can only matter when it's in the first segment (it's
+        # read from first_segment below), so don't scan the whole response
+        if "No direct trains found" in first_segment: # Simplified check
             # Example: "SL,CLASS,~,~,~,No direct trains found<br>Try options"
             # The JS splits by ~ and takes 5th element, then splits by < and takes 0th.
             try:
-                nore_check_parts = first_part_for_no_direct.split("~")
+                nore_check_parts = first_segment.split(_SEP_FIELD)
                 if len(nore_check_parts) > 5:
                     message_part = nore_check_parts[5].split("<")[0]
                     if message_part == "No direct trains found":
                         retval["success"] = False
-                        retval["time_stamp"] = _current_timestamp_ms()
+                        retval["time_stamp"] = time_stamp
                         retval["data"] = message_part
                         return retval
             except IndexError:
@@ -38,109 +218,61 @@ def between_station_logic(api_response_text: str):
 
         # Check for other specific full-string error messages from the JS
         # JS: data[0] === "~~~~~Please try again after some time."
-        # This implies string itself might start with these after the first split by ~~~~~~~~
-        # Or, the string itself is just that error message.
-        # Assuming these are exact matches for the first segment if data is split by "~~~~~~~~"
-        # For robustness, we can check if the api_response_text *contains* these key phrases
-        # if it's not structured data.
-
-        # The JS `data = string.split("~~~~~~~~"); if (data[0] === "~~~~~Please try again after some time.")`
-        # implies data[0] can be exactly "~~~~~Please try again after some time."
-        
-        potential_error_messages = [
-            "~~~~~Please try again after some time.",
-            "~~~~~From station not found",
-            "~~~~~To station not found"
-        ]
-        
-        # If the string starts with one of these (typical for single error responses)
-        first_segment_error_check = api_response_text.split("~~~~~~~~")[0]
-        if first_segment_error_check in potential_error_messages:
+        # This implies data[0] can be exactly one of _BETWEEN_STATION_ERRORS
+        # (typical for single error responses)
+        if first_segment in _BETWEEN_STATION_ERRORS:
             retval["success"] = False
-            retval["time_stamp"] = _current_timestamp_ms()
-            retval["data"] = first_segment_error_check.replace("~", "")
+            retval["time_stamp"] = time_stamp
+            retval["data"] = first_segment.replace("~", "")
             return retval
 
-        data_segments = api_response_text.split("~~~~~~~~")
-        data_segments = [el for el in data_segments if el] # Filter out empty strings
-
-        if not data_segments and not retval: # If after all checks, no data and no error set
+        if _fast_parse_between_stations is not None:
+            # Compiled parser (train_api/_fastparse.pyx) walks the whole response
+            arr, saw_segment = _fast_parse_between_stations(api_response_text)
+        else:
+            # Only now split the remainder of the response; segments are consumed
+            # lazily, skipping empty strings, without building a filtered list
+            remaining_segments = rest.split(_SEP_BIG) if sep else ()
+            saw_segment = bool(first_segment) or any(remaining_segments)
+            data_segments = filter(None, itertools.chain((first_segment,), remaining_segments))
+            arr = list(_iter_trains(data_segments))
+
+        if not saw_segment: # If after all checks, no data and no error set
             retval["success"] = False
-            retval["time_stamp"] = _current_timestamp_ms()
+            retval["time_stamp"] = time_stamp
             retval["data"] = "Unknown error or empty response from API."
             return retval
-            
-        for segment in data_segments:
-            parts = segment.split("~^")
-            if len(parts) == 2:
-                train_data_str = parts[1]
-                train_details = [el for el in train_data_str.split("~") if el]
-
-                if len(train_details) >= 14: # Ensure enough data points
-                    obj = {
-                        "train_no": train_details[0],
-                        "train_name": train_details[1],
-                        "source_stn_name": train_details[2],
-                        "source_stn_code": train_details[3],
-                        "dstn_stn_name": train_details[4],
-                        "dstn_stn_code": train_details[5],
-                        "from_stn_name": train_details[6],
-                        "from_stn_code": train_details[7],
-                        "to_stn_name": train_details[8],
-                        "to_stn_code": train_details[9],
-                        "from_time": train_details[10],
-                        "to_time": train_details[11],
-                        "travel_time": train_details[12],
-                        # "running_days": train_details[13], # This needs to be parsed into a list/array
-                    }
-                    # Parse running_days string "YNNYYNY" into [1,0,0,1,1,0,1]
-                    # Assuming Y=1, N=0. The order depends on erail's convention (e.g., Mon-Sun or Sun-Sat)
-                    # The JS getDayOnDate output suggests an indexing that might match this.
-                    # For now, let's store it as a string, or parse it if the convention is known.
-                    # Example: Monday to Sunday
-                    raw_running_days = train_details[13]
-                    parsed_running_days = [1 if day_char == 'Y' else 0 for day_char in raw_running_days]
-                    if len(parsed_running_days) == 7: # Standard 7 days
-                         obj["running_days_str"] = raw_running_days # Keep original string
-                         obj["running_days"] = parsed_running_days # Parsed list
-                    else: # Fallback or handle error
-                        obj["running_days_str"] = raw_running_days
-                        obj["running_days"] = [] # Or some error indicator
-
-
-                    train_base_obj = {"train_base": obj}
-                    arr.append(train_base_obj)
-        
+
         if not arr and not retval.get("success", True): # If parsing failed to produce any trains and no prior error set
              retval["success"] = False
-             retval["time_stamp"] = _current_timestamp_ms()
+             retval["time_stamp"] = time_stamp
              retval["data"] = "No train data could be parsed."
              return retval
         elif not arr and retval.get("success", True) : # No error but no data found, this shouldn't happen if check above works
              retval["success"] = False # Or True if an empty list of trains is a valid success
-             retval["time_stamp"] = _current_timestamp_ms()
+             retval["time_stamp"] = time_stamp
              retval["data"] = "No direct trains found or data format issue." # More specific message
              return retval
 
 
         retval["success"] = True
-        retval["time_stamp"] = _current_timestamp_ms()
+        retval["time_stamp"] = time_stamp
         retval["data"] = arr
         return retval
 
     except Exception as e:
         # Log the error properly in a real application
-        print(f"Error in between_station_logic: {e} with data: {api_response_text[:200]}") # Log snippet of data
+        logger.exception("Error in between_station_logic with data: %.200s", api_response_text) # Log snippet of data
         return {
             "success": False,
-            "time_stamp": _current_timestamp_ms(),
+            "time_stamp": time_stamp,
             "data": f"An error occurred during data processing: {str(e)}",
         }
 
 
-def get_day_on_date_logic(dd_str: str, mm_str: str, yyyy_str: str) -> int:
+def running_day_index(travel_date: date) -> int:
     """
-    Converts date to a specific day index.
+    Converts a date to its index into running_days.
     JS logic: `date.getDay() >= 0 && date.getDay() <= 2 ? date.getDay() + 4 : date.getDay() - 3;`
     JS getDay(): Sun=0, Mon=1, Tue=2, Wed=3, Thu=4, Fri=5, Sat=6
     Mapping from JS: Wed (0), Thu (1), Fri (2), Sat (3), Sun (4), Mon (5), Tue (6)
@@ -148,50 +280,21 @@ def get_day_on_date_logic(dd_str: str, mm_str: str, yyyy_str: str) -> int:
     Python weekday(): Mon=0, Tue=1, Wed=2, Thu=3, Fri=4, Sat=5, Sun=6
     The required Python mapping: (python_weekday + 5) % 7
     """
-    try:
-        dd = int(dd_str)
-        mm = int(mm_str) # JS Date uses 0-indexed month if numbers, but from string it's fine.
-        yyyy = int(yyyy_str)
-        
-        # Python's datetime takes month 1-indexed
-        date_obj = datetime(yyyy, mm, dd)
-        
-        py_weekday = date_obj.weekday() # Mon:0, Tue:1, Wed:2, Thu:3, Fri:4, Sat:5, Sun:6
-        
-        # Target mapping based on JS: Wed(0), Thu(1), Fri(2), Sat(3), Sun(4), Mon(5), Tue(6)
-        # Mon (0) -> 5
-        # Tue (1) -> 6
-        # Wed (2) -> 0
-        # Thu (3) -> 1
-        # Fri (4) -> 2
-        # Sat (5) -> 3
-        # Sun (6) -> 4
-        # This is equivalent to (py_weekday + 5) % 7
-        mapped_day_index = (py_weekday + 5) % 7
-        return mapped_day_index
-    except ValueError:
-        print(f"Invalid date components for get_day_on_date_logic: {dd_str}-{mm_str}-{yyyy_str}")
-        return -1 # Indicate error, consistent with how your Django view might check
+    return (travel_date.weekday() + 5) % 7
 
+@_cached_parse
 def get_route_logic(api_response_text: str):
+    time_stamp = _current_timestamp_ms()
     try:
         retval = {}
         arr = []
         
-        data_segments = api_response_text.split("~^")
-        data_segments = [el for el in data_segments if el]
-
-        if not data_segments:
-            return {
-                "success": False,
-                "time_stamp": _current_timestamp_ms(),
-                "data": "No route data found in response."
-            }
-
-        for segment in data_segments:
-            details = [el for el in segment.split("~") if el]
+        saw_segment = False
+        for segment in filter(None, api_response_text.split(_SEP_TRAIN)):
+            saw_segment = True
             # JS code implies specific indices, ensure they exist
-            if len(details) > 9: # Check based on max index used (9 for zone)
+            details = _parse_row(segment, 10) # Check based on max index used (9 for zone)
+            if details is not None:
                 obj = {
                     "source_stn_name": details[2],
                     "source_stn_code": details[1],
@@ -202,57 +305,66 @@ def get_route_logic(api_response_text: str):
                     "zone": details[9]
                 }
                 arr.append(obj)
-        
+
+        if not saw_segment:
+            return {
+                "success": False,
+                "time_stamp": time_stamp,
+                "data": "No route data found in response."
+            }
+
         if not arr: # If segments were present but no valid details extracted
             return {
                 "success": False,
-                "time_stamp": _current_timestamp_ms(),
+                "time_stamp": time_stamp,
                 "data": "Could not parse route details from segments."
             }
 
         retval["success"] = True
-        retval["time_stamp"] = _current_timestamp_ms()
+        retval["time_stamp"] = time_stamp
         retval["data"] = arr
         return retval
     except Exception as e:
-        print(f"Error in get_route_logic: {e}")
+        logger.exception("Error in get_route_logic")
         return {
             "success": False,
-            "time_stamp": _current_timestamp_ms(),
+            "time_stamp": time_stamp,
             "data": f"An error occurred: {str(e)}",
         }
 
-def live_station_logic(soup: BeautifulSoup): # Expects a BeautifulSoup object
+def live_station_logic(tree: LexborHTMLParser): # Expects a parsed selectolax tree
+    time_stamp = _current_timestamp_ms()
     try:
         arr = []
         retval = {}
 
         # JS: $('.name').each((i,el)=>{...})
-        for item_name_el in soup.select('.name'):
+        for item_name_el in tree.css('.name'):
             obj = {}
             
             # train_no and train_name from item_name_el.text
-            full_train_text = item_name_el.get_text(strip=True)
+            full_train_text = item_name_el.text(strip=True)
             obj["train_no"] = full_train_text[:5]
             obj["train_name"] = full_train_text[5:].strip()
 
             # source_stn_name and dstn_stn_name from next div
-            next_div = item_name_el.find_next_sibling("div")
-            if next_div:
-                div_text = next_div.get_text(strip=True)
-                source_dest_parts = div_text.split("→")
-                obj["source_stn_name"] = source_dest_parts[0].strip() if len(source_dest_parts) > 0 else ""
-                obj["dstn_stn_name"] = source_dest_parts[1].strip() if len(source_dest_parts) > 1 else ""
+            next_div = _next_sibling(item_name_el, "div")
+            if next_div is not None:
+                div_text = next_div.text(strip=True)
+                source_part, sep, dest_part = div_text.partition("→")
+                obj["source_stn_name"] = source_part.strip()
+                # Only the text up to a second arrow (if any) is the destination
+                obj["dstn_stn_name"] = dest_part.partition("→")[0].strip() if sep else ""
             else:
                 obj["source_stn_name"] = ""
                 obj["dstn_stn_name"] = ""
             
             # time_at and detail from parent td's next td
-            parent_td = item_name_el.find_parent("td")
-            if parent_td:
-                next_status_td = parent_td.find_next_sibling("td")
-                if next_status_td:
-                    status_text = next_status_td.get_text(strip=True)
+            parent_td = _ancestor(item_name_el, "td")
+            if parent_td is not None:
+                next_status_td = _next_sibling(parent_td, "td")
+                if next_status_td is not None:
+                    status_text = next_status_td.text(strip=True)
                     obj["time_at"] = status_text[:5]
                     obj["detail"] = status_text[5:].strip() # In JS this was just slice(5)
                 else:
@@ -265,82 +377,78 @@ def live_station_logic(soup: BeautifulSoup): # Expects a BeautifulSoup object
             arr.append(obj)
         
         retval["success"] = True
-        retval["time_stamp"] = _current_timestamp_ms()
+        retval["time_stamp"] = time_stamp
         retval["data"] = arr
         return retval
     except Exception as e:
-        print(f"Error in live_station_logic: {e}")
+        logger.exception("Error in live_station_logic")
         return {
             "success": False,
-            "time_stamp": _current_timestamp_ms(),
+            "time_stamp": time_stamp,
             "data": f"An error occurred during HTML parsing: {str(e)}",
         }
 
+@_cached_parse
 def pnr_status_logic(html_string: str):
+    time_stamp = _current_timestamp_ms()
     retval = {}
     try:
-        # JS: var pattern = /data\s*=\s*({.*?;})/
         # JS: let match = string.match(pattern)[0].slice(7,-1)
-        # Python: Use re.search to find the pattern and extract the group
-        match = re.search(r"data\s*=\s*({.*?});", html_string, re.DOTALL) # re.DOTALL in case JSON spans newlines
+        json_data_string = _extract_pnr_json(html_string) # The {.*?} part
         
-        if match:
-            json_data_string = match.group(1) # Group 1 is the ({.*?}) part
-            parsed_data = json.loads(json_data_string) # Parse the extracted JSON string
+        if json_data_string is not None:
+            parsed_data = orjson.loads(json_data_string) # Parse the extracted JSON string
             
             retval["success"] = True
-            retval["time_stamp"] = _current_timestamp_ms()
+            retval["time_stamp"] = time_stamp
             retval["data"] = parsed_data
         else:
             retval["success"] = False
-            retval["time_stamp"] = _current_timestamp_ms()
+            retval["time_stamp"] = time_stamp
             retval["data"] = "Could not find PNR data in the page."
             
         return retval
-    except json.JSONDecodeError as e:
-        print(f"JSON parsing error in pnr_status_logic: {e}")
+    except orjson.JSONDecodeError:
+        logger.exception("JSON parsing error in pnr_status_logic")
         return {
             "success": False,
-            "time_stamp": _current_timestamp_ms(),
+            "time_stamp": time_stamp,
             "data": "Failed to parse PNR data from page.",
         }
     except Exception as e:
-        print(f"Error in pnr_status_logic: {e}")
+        logger.exception("Error in pnr_status_logic")
         return {
             "success": False,
-            "time_stamp": _current_timestamp_ms(),
+            "time_stamp": time_stamp,
             "data": f"An error occurred: {str(e)}",
         }
 
+@_cached_parse
 def check_train_logic(api_response_text: str):
+    time_stamp = _current_timestamp_ms()
     try:
         retval = {}
         
         # JS: data[0] === "~~~~~Please try again after some time." || data[0] === "~~~~~Train not found"
         # This implies the entire response or the first segment after split is the error
-        first_segment_error_check = api_response_text.split("~~~~~~~~")[0]
-        error_messages = [
-            "~~~~~Please try again after some time.",
-            "~~~~~Train not found"
-        ]
-        if first_segment_error_check in error_messages:
+        first_segment_error_check, sep, rest = api_response_text.partition(_SEP_BIG)
+        if first_segment_error_check in _CHECK_TRAIN_ERRORS:
             retval["success"] = False
-            retval["time_stamp"] = _current_timestamp_ms()
+            retval["time_stamp"] = time_stamp
             retval["data"] = first_segment_error_check.replace("~", "")
             return retval
 
-        data_segments = api_response_text.split("~~~~~~~~")
-        
-        if len(data_segments) < 2: # Expecting at least two segments for train details
+        if not sep: # Expecting at least two segments for train details
              return {
                 "success": False,
-                "time_stamp": _current_timestamp_ms(),
+                "time_stamp": time_stamp,
                 "data": "Invalid data format for train details."
             }
 
         # Process first segment for primary details
-        details_part1_str = data_segments[0]
-        details_part1 = [el for el in details_part1_str.split("~") if el]
+        details_part1_str = first_segment_error_check
+        # 15 fields need at least 14 separators; skip the split otherwise
+        details_part1 = _split_tilde(details_part1_str) if details_part1_str.count(_SEP_FIELD) >= 14 else []
         
         # JS: if (data1[1].length > 6) { data1.shift(); }
         # This implies some conditional prefix or format issue on details_part1[1]
@@ -363,41 +471,40 @@ def check_train_logic(api_response_text: str):
         if len(details_part1) < 15:
              return {
                 "success": False,
-                "time_stamp": _current_timestamp_ms(),
+                "time_stamp": time_stamp,
                 "data": "Not enough data in the first part of train details."
             }
 
+        (train_no, train_name, from_stn_name, from_stn_code, to_stn_name, to_stn_code,
+         _, _, _, _, from_time, to_time, travel_time,
+         raw_running_days_ct) = details_part1[:14] # JS used 14 for running_days
+
+        # Similar running_days parsing as in BetweenStation
+        parsed_running_days_ct = _parse_running_days(raw_running_days_ct)
+
         obj = {
-            "train_no": details_part1[0].replace("^", ""), # JS used details_part1[1] after shift logic
-            "train_name": details_part1[1],
-            "from_stn_name": details_part1[2],
-            "from_stn_code": details_part1[3],
-            "to_stn_name": details_part1[4],
-            "to_stn_code": details_part1[5],
-            "from_time": details_part1[10],
-            "to_time": details_part1[11],
-            "travel_time": details_part1[12],
-            # "running_days": details_part1[13], # Similar parsing as in BetweenStation
+            "train_no": train_no.replace("^", ""), # JS used details_part1[1] after shift logic
+            "train_name": train_name,
+            "from_stn_name": from_stn_name,
+            "from_stn_code": from_stn_code,
+            "to_stn_name": to_stn_name,
+            "to_stn_code": to_stn_code,
+            "from_time": from_time,
+            "to_time": to_time,
+            "travel_time": travel_time,
+            "running_days_str": raw_running_days_ct,
+            "running_days": parsed_running_days_ct,
         }
-        raw_running_days_ct = details_part1[13] # JS used 14
-        parsed_running_days_ct = [1 if day_char == 'Y' else 0 for day_char in raw_running_days_ct]
-        if len(parsed_running_days_ct) == 7:
-            obj["running_days_str"] = raw_running_days_ct
-            obj["running_days"] = parsed_running_days_ct
-        else:
-            obj["running_days_str"] = raw_running_days_ct
-            obj["running_days"] = []
-
 
-        # Process second segment for additional details
-        details_part2_str = data_segments[1]
-        details_part2 = [el for el in details_part2_str.split("~") if el]
+        # Process second segment for additional details; nothing past it is
+        # used, so partition() instead of splitting the rest of the response
+        details_part2_str = rest.partition(_SEP_BIG)[0]
+        details_part2 = _parse_row(details_part2_str, 20) # Max index used for part2 is 19
 
-        # Max index used for part2 is 19
-        if len(details_part2) < 20:
+        if details_part2 is None:
             return {
                 "success": False,
-                "time_stamp": _current_timestamp_ms(),
+                "time_stamp": time_stamp,
                 "data": "Not enough data in the second part of train details."
             }
 
@@ -407,21 +514,21 @@ def check_train_logic(api_response_text: str):
         obj["average_speed"] = details_part2[19]
         
         retval["success"] = True
-        retval["time_stamp"] = _current_timestamp_ms()
+        retval["time_stamp"] = time_stamp
         retval["data"] = obj
         return retval
 
     except IndexError as e:
-        print(f"Index error in check_train_logic: {e}. Data: {api_response_text[:200]}")
+        logger.exception("Index error in check_train_logic. Data: %.200s", api_response_text)
         return {
             "success": False,
-            "time_stamp": _current_timestamp_ms(),
+            "time_stamp": time_stamp,
             "data": f"Data parsing error (index out of bounds): {str(e)}",
         }
     except Exception as e:
-        print(f"Error in check_train_logic: {e}. Data: {api_response_text[:200]}")
+        logger.exception("Error in check_train_logic. Data: %.200s", api_response_text)
         return {
             "success": False,
-            "time_stamp": _current_timestamp_ms(),
+            "time_stamp": time_stamp,
             "data": f"An error occurred: {str(e)}",
         }
\ No newline at end of file
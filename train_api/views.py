@@ -1,234 +1,472 @@
-from django.http import JsonResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse
+import asyncio
+import atexit
+import codecs
+import contextlib
+import contextvars
+import functools
+import math
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import httpx # For asynchronous HTTP requests
+import logging
+import orjson
 import time
-from user_agents import parse as ua_parse # For User-Agent generation
-from bs4 import BeautifulSoup # For HTML parsing
+from urllib.parse import quote
+from datetime import datetime
+from typing import Callable, NamedTuple, Optional
+from selectolax.lexbor import LexborHTMLParser # For HTML parsing
 
 from . import utils # Our prettify equivalents
 
-# Create an asynchronous HTTP client session to be reused
-# It's good practice to create it once if you're making many requests.
-# For simplicity in these examples, we'll create it per request,
-# but for high-load applications, consider managing a global or app-level client.
-
-async def get_train_view(request):
-    train_no = request.GET.get('trainNo')
-    if not train_no:
-        return JsonResponse({'success': False, 'error': 'trainNo parameter is required'}, status=400)
-
-    url_train = f"https://erail.in/rail/getTrains.aspx?TrainNo={train_no}&DataSource=0&Language=0&Cache=true"
-    
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url_train, timeout=10.0) # Added timeout
-            response.raise_for_status() # Raise an exception for HTTP errors (4xx or 5xx)
-            data_text = response.text
-        
-        json_response_data = utils.check_train_logic(data_text)
-        return JsonResponse(json_response_data)
-    except httpx.HTTPStatusError as e:
-        return JsonResponse({'success': False, 'error': f'HTTP error: {e.response.status_code} - {e.response.text}'}, status=e.response.status_code)
-    except httpx.RequestError as e: # Catches network errors, timeouts, etc.
-        return JsonResponse({'success': False, 'error': f'Request failed: {str(e)}'}, status=500)
-    except Exception as e:
-        return JsonResponse({'success': False, 'error': str(e)}, status=500)
-
-
-async def between_stations_view(request):
-    station_from = request.GET.get('from')
-    station_to = request.GET.get('to')
-
-    if not station_from or not station_to:
-        return JsonResponse({'success': False, 'error': 'Both from and to parameters are required'}, status=400)
-
-    url_trains = (f"https://erail.in/rail/getTrains.aspx?Station_From={station_from}"
-                  f"&Station_To={station_to}&DataSource=0&Language=0&Cache=true")
-    
+logger = logging.getLogger(__name__)
+
+# Browser User-Agent sent with every upstream request
+_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+_UPSTREAM_RETRIES = 3
+
+def _new_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        # Accept-Encoding is left to httpx, which asks for br because
+        # setup.py installs httpx[brotli]
+        headers={"User-Agent": _USER_AGENT},
+        timeout=10.0,
+        # Failed connects are retried (with backoff) inside the transport,
+        # so a transient connection error doesn't reach the views at all
+        transport=httpx.AsyncHTTPTransport(
+            http2=True, # Multiplex concurrent/back-to-back calls to the same host
+            retries=_UPSTREAM_RETRIES,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        ),
+    )
+
+# Under an ASGI server (uvicorn, daphne, hypercorn) each worker runs one
+# long-lived event loop, and a single client is shared by every view so
+# connections to erail.in / confirmtkt.com are kept alive across requests.
+# Under WSGI (runserver, gunicorn sync workers) Django runs each async view
+# in a fresh loop that is closed afterwards, so nothing can be shared:
+# _request_client_scope gives such a request its own client and closes it
+# when the request is done.
+_client = None
+_client_loop = None
+_request_client = contextvars.ContextVar("_request_client", default=None)
+
+def get_client() -> httpx.AsyncClient:
+    global _client, _client_loop
+    client = _request_client.get()
+    if client is not None:
+        return client
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = _new_client()
+        _client_loop = loop
+    return _client
+
+@contextlib.asynccontextmanager
+async def _request_client_scope(request):
+    if isinstance(request, ASGIRequest):
+        yield
+        return
+    async with _new_client() as client:
+        token = _request_client.set(client)
+        try:
+            yield
+        finally:
+            _request_client.reset(token)
+
+@atexit.register
+def _close_client():
+    if _client is None or _client.is_closed or _client_loop.is_closed():
+        return
     try:
-        user_agent_string = str(ua_parse("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")) # Generate a user agent
-        headers = {'User-Agent': user_agent_string}
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url_trains, headers=headers, timeout=10.0)
-            response.raise_for_status()
-            data_text = response.text
-            
-        json_response_data = utils.between_station_logic(data_text)
-        return JsonResponse(json_response_data)
-    except httpx.HTTPStatusError as e:
-        return JsonResponse({'success': False, 'error': f'HTTP error: {e.response.status_code} - {e.response.text}'}, status=e.response.status_code)
-    except httpx.RequestError as e:
-        return JsonResponse({'success': False, 'error': f'Request failed: {str(e)}'}, status=500)
-    except Exception as e:
-        # Log the full error for debugging
-        print(f"Error in between_stations_view: {e}")
-        return JsonResponse({'success': False, 'error': 'An unexpected error occurred.'}, status=500)
-
-
-async def get_train_on_view(request):
-    station_from = request.GET.get('from')
-    station_to = request.GET.get('to')
-    date_str = request.GET.get('date') # e.g., "25-12-2023" DD-MM-YYYY
-
-    retval = {}
-
-    if not all([station_from, station_to, date_str]):
-        return JsonResponse({
-            "success": False,
-            "time_stamp": int(time.time() * 1000),
-            "data": "Parameters 'from', 'to', and 'date' are required."
-        }, status=400)
-
+        _client_loop.run_until_complete(_client.aclose())
+    except RuntimeError: # Loop still running (e.g. interpreter torn down mid-serve)
+        pass
+
+# In-process LRU map with a per-entry expiry, for the caches on the request
+# path. Lookups are plain dict operations, so unlike Django's cache API
+# (whose default async methods hop through sync_to_async) they never leave
+# the event loop. The lock is there because under WSGI each request runs its
+# own loop on its own thread. Entries are per process: every worker keeps
+# its own copy, which is fine for data that is revalidated or short-lived.
+class _TTLCache:
+    def __init__(self, maxsize: int):
+        self._maxsize = maxsize
+        self._data = OrderedDict() # key -> (expires_at, value), most recently used last
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl: float = math.inf): # No expiry by default
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            if len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+# Upstream responses are kept with their ETag/Last-Modified validators and
+# revalidated with a conditional GET on every use. A 304 returns the cached
+# body, and utils' parse cache then skips re-parsing it.
+_UPSTREAM_CACHE_TTL = 60 * 60 # Seconds
+_upstream_cache = _TTLCache(256) # url -> (etag, last_modified, content, encoding)
+
+async def _fetch_content(url: str, **kwargs) -> tuple[bytes, str]:
+    cached = _upstream_cache.get(url)
+
+    headers = {}
+    if cached is not None:
+        etag, last_modified, _, _ = cached
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+    response = await get_client().get(url, headers=headers, **kwargs)
+    if response.status_code == 304 and cached is not None:
+        return cached[2], cached[3]
+    response.raise_for_status() # Raise an exception for HTTP errors (4xx or 5xx)
+
+    content, encoding = response.content, response.encoding
+    etag = response.headers.get("etag")
+    last_modified = response.headers.get("last-modified")
+    if etag or last_modified:
+        _upstream_cache.set(url, (etag, last_modified, content, encoding), _UPSTREAM_CACHE_TTL)
+    return content, encoding
+
+# Requests for a URL that is already being fetched wait on that fetch instead
+# of going upstream again, so a burst on one popular train or station costs a
+# single round trip. Entries are tasks, which belong to one event loop, and
+# waiters are shielded so one client disconnecting doesn't cancel the others.
+_inflight = {} # url -> asyncio.Task
+
+def _forget_inflight(url: str, task: asyncio.Task):
+    if _inflight.get(url) is task:
+        del _inflight[url]
+    if not task.cancelled():
+        task.exception() # Retrieved even if every waiter went away
+
+# Returns the raw response body and the encoding httpx would decode it with
+async def fetch_content(url: str, **kwargs) -> tuple[bytes, str]:
+    loop = asyncio.get_running_loop()
+    task = _inflight.get(url)
+    if task is None or task.get_loop() is not loop:
+        task = loop.create_task(_fetch_content(url, **kwargs))
+        task.add_done_callback(functools.partial(_forget_inflight, url))
+        _inflight[url] = task
+    return await asyncio.shield(task)
+
+# coalesce=False skips the in-flight map, for fetches that may be cancelled:
+# a shared fetch is shielded and would run to completion regardless
+async def fetch_text(url: str, coalesce: bool = True, **kwargs) -> str:
+    content, encoding = await (fetch_content if coalesce else _fetch_content)(url, **kwargs)
+    return content.decode(encoding, errors="replace") # Same as httpx's response.text
+
+# Parsing is synchronous and can take milliseconds on big responses, so it
+# runs on a worker thread to keep the event loop serving other requests.
+# The pool is ours rather than the loop's default executor because runserver
+# gives every async view a fresh loop; utils' parse cache is thread-safe.
+_parse_executor = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4), thread_name_prefix="parse")
+
+async def run_parser(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(_parse_executor, func, *args)
+
+# Definitive "not found" results (see utils.is_not_found) are cached for a few
+# minutes, so repeated lookups of a bogus train or station pair skip the
+# upstream call and the parse. Other failures ("Please try again", parse
+# errors, captcha pages) are transient and always go back upstream, and
+# successful results go through the ETag revalidation instead.
+_NEGATIVE_CACHE_TTL = 5 * 60 # Seconds
+_negative_cache = _TTLCache(4096) # url -> parsed result
+
+def _cached_not_found(url: str):
+    cached = _negative_cache.get(url)
+    if cached is None:
+        return None
+    return {**cached, "time_stamp": utils._current_timestamp_ms()} # The cached dict is shared
+
+async def fetch_parsed(url: str, parser, **kwargs) -> dict:
+    cached = _cached_not_found(url)
+    if cached is not None:
+        return cached
+
+    data_text = await fetch_text(url, **kwargs)
+    json_response_data = await run_parser(parser, data_text)
+    if utils.is_not_found(json_response_data):
+        _negative_cache.set(url, json_response_data, _NEGATIVE_CACHE_TTL)
+    return json_response_data
+
+# Upstream endpoints. Query strings are built by httpx from params dicts and
+# path segments are quoted, so user input is always URL-encoded
+_ERAIL_TRAINS_URL = "https://erail.in/rail/getTrains.aspx"
+_ERAIL_DATA_URL = "https://erail.in/data.aspx"
+_ERAIL_LIVE_URL = "https://erail.in/station-live/"
+_PNR_URL = "https://www.confirmtkt.com/pnr-status/"
+_ERAIL_DEFAULT_PARAMS = {"DataSource": "0", "Language": "0", "Cache": "true"}
+
+# The full URL string is what the upstream cache and in-flight map are keyed on
+def _build_url(base: str, params=None) -> str:
+    return str(httpx.URL(base, params=params))
+
+def _trains_url(**params) -> str:
+    return _build_url(_ERAIL_TRAINS_URL, {**params, **_ERAIL_DEFAULT_PARAMS})
+
+# Query parameter formats, checked before anything is sent upstream so
+# malformed input gets a 400 without a wasted round trip
+_TRAIN_NO_RE = re.compile(r"[0-9]{4,5}")
+_PNR_RE = re.compile(r"[0-9]{10}")
+_STATION_CODE_RE = re.compile(r"[A-Z]{1,8}") # Matched after upper(); e.g. "R" is Raipur Jn
+_DATE_RE = re.compile(r"[0-9]{2}-[0-9]{2}-[0-9]{4}") # DD-MM-YYYY
+
+def _station_code(value):
+    code = value.strip().upper()
+    return code if _STATION_CODE_RE.fullmatch(code) else None
+
+# Cleaners for the query parameters: each returns the value to use upstream,
+# or None if the input is malformed
+def _train_no(value):
+    return value if _TRAIN_NO_RE.fullmatch(value) else None
+
+def _pnr(value):
+    return value if _PNR_RE.fullmatch(value) else None
+
+# A DD-MM-YYYY date becomes its index into running_days. The regex rejects
+# unpadded dates that strptime would accept; strptime rejects e.g. 31-02
+def _travel_day_index(value):
+    if not _DATE_RE.fullmatch(value):
+        return None
     try:
-        dd, mm, yyyy = date_str.split("-")
+        travel_date = datetime.strptime(value, "%d-%m-%Y")
     except ValueError:
-        return JsonResponse({
-            "success": False,
-            "time_stamp": int(time.time() * 1000),
-            "data": "Invalid date format. Please use DD-MM-YYYY."
-        }, status=400)
-
-    url_trains = (f"https://erail.in/rail/getTrains.aspx?Station_From={station_from}"
-                  f"&Station_To={station_to}&DataSource=0&Language=0&Cache=true")
-    
-    try:
-        user_agent_string = ua_parse("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36").toString()
-        headers = {'User-Agent': user_agent_string}
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url_trains, headers=headers, timeout=10.0)
-            response.raise_for_status()
-            data_text = response.text
-
-        initial_json = utils.between_station_logic(data_text)
-
-        if not initial_json.get("success"):
-            return JsonResponse(initial_json)
-
-        day_index = utils.get_day_on_date_logic(dd, mm, yyyy)
-        if day_index == -1: # Invalid date from util
-             return JsonResponse({
-                "success": False,
-                "time_stamp": int(time.time() * 1000),
-                "data": "Invalid date provided for processing."
-            }, status=400)
-
-
-        filtered_trains = []
-        if initial_json.get("data") and isinstance(initial_json["data"], list):
-            for train_details in initial_json["data"]:
-                # Ensure the path to running_days is correct as per your actual utils.between_station_logic output
-                running_days = train_details.get("train_base", {}).get("running_days", [])
-                if 0 <= day_index < len(running_days) and running_days[day_index] == 1:
-                    filtered_trains.append(train_details)
-        
-        retval["success"] = True
-        retval["time_stamp"] = int(time.time() * 1000)
-        retval["data"] = filtered_trains
-        return JsonResponse(retval)
+        return None
+    return utils.running_day_index(travel_date)
+
+# JSON responses are serialized with orjson, which is much faster than
+# JsonResponse's DjangoJSONEncoder on the larger train lists and PNR payloads
+def OrjsonResponse(data, status=200) -> HttpResponse:
+    return HttpResponse(orjson.dumps(data), content_type="application/json", status=status)
+
+# One query parameter: its name, its cleaner, and the 400 message when the
+# cleaner rejects it
+class Param(NamedTuple):
+    name: str
+    clean: Callable
+    invalid: str
+
+# How an endpoint is served. url builds the upstream URL from the cleaned
+# params, and fetch(spec, params) returns the response dict; by default
+# that is the upstream body run through logic. getTrainOn historically
+# reports its 400s under "data" rather than "error"
+class Spec(NamedTuple):
+    params: tuple
+    missing: str
+    url: Callable
+    logic: Callable
+    timeout: float = 10.0
+    fetch: Optional[Callable] = None
+    error_key: str = 'error'
+
+# Raised by a fetch hook for a failure that has its own message and status
+class EndpointError(Exception):
+    def __init__(self, message: str, status: int = 500):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+async def _fetch_default(spec: Spec, params: dict) -> dict:
+    return await fetch_parsed(spec.url(params), spec.logic, timeout=spec.timeout)
+
+# Every view goes through here: parameter validation, then the endpoint's
+# fetch, with the same upstream error handling for all of them. HTTP errors
+# are passed through with erail's status code; network failures and anything
+# unexpected become a 500
+async def _dispatch(request, spec: Spec):
+    params = {p.name: request.GET.get(p.name, '').strip() for p in spec.params}
+    if not all(params.values()):
+        return OrjsonResponse({'success': False, spec.error_key: spec.missing}, status=400)
+    for p in spec.params:
+        params[p.name] = p.clean(params[p.name])
+        if params[p.name] is None:
+            return OrjsonResponse({'success': False, spec.error_key: p.invalid}, status=400)
 
+    try:
+        async with _request_client_scope(request):
+            json_response_data = await (spec.fetch or _fetch_default)(spec, params)
+        return OrjsonResponse(json_response_data)
+    except EndpointError as e:
+        return OrjsonResponse({'success': False, 'error': e.message}, status=e.status)
     except httpx.HTTPStatusError as e:
-        return JsonResponse({'success': False, 'error': f'HTTP error: {e.response.status_code} - {e.response.text}'}, status=e.response.status_code)
+        return OrjsonResponse({'success': False, 'error': f'HTTP error: {e.response.status_code} - {e.response.text}'}, status=e.response.status_code)
     except httpx.RequestError as e:
-        return JsonResponse({'success': False, 'error': f'Request failed: {str(e)}'}, status=500)
-    except Exception as e:
-        print(f"Error in get_train_on_view: {e}")
-        return JsonResponse({'success': False, 'error': 'An unexpected error occurred.'}, status=500)
-
-
-async def get_route_view(request):
-    train_no = request.GET.get('trainNo')
-    if not train_no:
-        return JsonResponse({'success': False, 'error': 'trainNo parameter is required'}, status=400)
-
-    url_train_details = f"https://erail.in/rail/getTrains.aspx?TrainNo={train_no}&DataSource=0&Language=0&Cache=true"
+        return OrjsonResponse({'success': False, 'error': f'Request failed: {str(e)}'}, status=500)
+    except Exception:
+        logger.exception("Error in %s", request.path)
+        return OrjsonResponse({'success': False, 'error': 'An unexpected error occurred.'}, status=500)
+
+async def _fetch_train_on(spec: Spec, params: dict) -> dict:
+    initial_json = await _fetch_default(spec, params)
+    if not initial_json.get("success"):
+        return initial_json
+
+    day_index = params['date'] # From utils.running_day_index
+
+    # utils.between_station_logic always sets train_base.running_days to
+    # either 7 entries or [], and day_index is 0-6, so no bounds check needed
+    trains = initial_json.get("data")
+    filtered_trains = [
+        train_details for train_details in trains
+        if (running_days := train_details["train_base"]["running_days"]) and running_days[day_index] == 1
+    ] if isinstance(trains, list) else []
+
+    return {"success": True, "time_stamp": utils._current_timestamp_ms(), "data": filtered_trains}
+
+# train_no -> train_id; a _TTLCache (without expiry) for its lock, since
+# every request updates it
+_TRAIN_ID_CACHE_SIZE = 1024
+_train_ids = _TTLCache(_TRAIN_ID_CACHE_SIZE)
+
+def _route_url(train_id: str) -> str:
+    return _build_url(_ERAIL_DATA_URL, {"Action": "TRAINROUTE", "Password": "2012",
+                                        "Data1": train_id, "Data2": "0", "Cache": "true"})
+
+# Cancel a task we no longer need, or mark its exception as retrieved
+def _discard_task(task: asyncio.Task):
+    if not task.done():
+        task.cancel()
+    elif not task.cancelled():
+        task.exception()
+
+async def _fetch_route(spec: Spec, params: dict) -> dict:
+    train_no = params['trainNo']
+    url_train_details = spec.url(params)
+
+    # A train already known not to exist gets no speculative route fetch
+    cached = _cached_not_found(url_train_details)
+    if cached is not None:
+        return cached
+
+    # erail's train_id is usually the train number itself, so the route is
+    # fetched speculatively in parallel with the details call, using the
+    # remembered train_id if this train has been looked up before. It isn't
+    # coalesced, so cancelling a wrong guess really stops the request
+    guessed_train_id = _train_ids.get(train_no) or train_no
+    route_task = asyncio.create_task(
+        fetch_text(_route_url(guessed_train_id), coalesce=False, timeout=spec.timeout))
 
     try:
-        async with httpx.AsyncClient() as client:
-            # First call to get train details (and train_id)
-            response_details = await client.get(url_train_details, timeout=10.0)
-            response_details.raise_for_status()
-            details_text = response_details.text
-            
-            train_info_json = utils.check_train_logic(details_text)
-            if not train_info_json.get("success") or not train_info_json.get("data"):
-                return JsonResponse(train_info_json)
-
-            train_id = train_info_json["data"].get("train_id")
-            if not train_id:
-                 return JsonResponse({'success': False, 'error': 'Could not extract train_id from initial train data.'}, status=500)
-
-            # Second call to get the route
-            url_route = (f"https://erail.in/data.aspx?Action=TRAINROUTE&Password=2012"
-                         f"&Data1={train_id}&Data2=0&Cache=true")
-            
-            response_route = await client.get(url_route, timeout=10.0)
-            response_route.raise_for_status()
-            route_text = response_route.text
-            
-            route_json = utils.get_route_logic(route_text)
-            return JsonResponse(route_json) # Note: Express used resp.send(), JsonResponse is typical for dicts
+        # First call to get train details (and train_id)
+        train_info_json = await fetch_parsed(url_train_details, utils.check_train_logic, timeout=spec.timeout)
+        if not train_info_json.get("success") or not train_info_json.get("data"):
+            return train_info_json
+
+        train_id = train_info_json["data"].get("train_id")
+        if not train_id:
+            raise EndpointError('Could not extract train_id from initial train data.')
+        _train_ids.set(train_no, train_id)
+
+        # Second call to get the route, unless the speculative one was right
+        if train_id == guessed_train_id:
+            route_text = await route_task
+        else:
+            route_text = await fetch_text(_route_url(train_id), timeout=spec.timeout)
+
+        return await run_parser(spec.logic, route_text)
+    finally:
+        _discard_task(route_task)
+
+# Parse HTML using selectolax's Lexbor backend (equivalent to Cheerio).
+# Lexbor reads UTF-8 bytes directly, so only other charsets are decoded
+def _parse_live(html_bytes: bytes, encoding: str) -> dict:
+    if codecs.lookup(encoding).name != "utf-8":
+        html_bytes = html_bytes.decode(encoding, errors="replace")
+    tree = LexborHTMLParser(html_bytes)
+    return utils.live_station_logic(tree) # Pass the parsed tree
+
+# Live boards change minute to minute, so they skip the negative cache
+async def _fetch_live(spec: Spec, params: dict) -> dict:
+    html_bytes, encoding = await fetch_content(spec.url(params), timeout=spec.timeout)
+    return await run_parser(spec.logic, html_bytes, encoding)
+
+_TRAIN_NO_PARAM = Param('trainNo', _train_no, 'trainNo must be a 4 or 5 digit train number')
+
+ENDPOINTS = {
+    "train": Spec(
+        params=(_TRAIN_NO_PARAM,),
+        missing='trainNo parameter is required',
+        url=lambda p: _trains_url(TrainNo=p['trainNo']),
+        logic=utils.check_train_logic,
+    ),
+    "between": Spec(
+        params=(Param('from', _station_code, 'from and to must be station codes'),
+                Param('to', _station_code, 'from and to must be station codes')),
+        missing='Both from and to parameters are required',
+        url=lambda p: _trains_url(Station_From=p['from'], Station_To=p['to']),
+        logic=utils.between_station_logic,
+    ),
+    "train_on": Spec(
+        params=(Param('from', _station_code, "Parameters 'from' and 'to' must be station codes."),
+                Param('to', _station_code, "Parameters 'from' and 'to' must be station codes."),
+                Param('date', _travel_day_index, "Invalid date format. Please use DD-MM-YYYY.")), # e.g., "25-12-2023"
+        missing="Parameters 'from', 'to', and 'date' are required.",
+        url=lambda p: _trains_url(Station_From=p['from'], Station_To=p['to']),
+        logic=utils.between_station_logic,
+        fetch=_fetch_train_on,
+        error_key='data',
+    ),
+    "route": Spec(
+        params=(_TRAIN_NO_PARAM,),
+        missing='trainNo parameter is required',
+        url=lambda p: _trains_url(TrainNo=p['trainNo']), # Train details, for the train_id
+        logic=utils.get_route_logic,
+        fetch=_fetch_route,
+    ),
+    "live": Spec(
+        params=(Param('code', _station_code, 'code must be a station code'),),
+        missing='code parameter (station code) is required',
+        url=lambda p: _build_url(_ERAIL_LIVE_URL + quote(p['code'], safe=""), _ERAIL_DEFAULT_PARAMS),
+        logic=_parse_live,
+        fetch=_fetch_live,
+    ),
+    "pnr": Spec(
+        params=(Param('pnr', _pnr, 'pnr must be a 10 digit PNR number'),),
+        missing='pnr parameter is required',
+        url=lambda p: _PNR_URL + quote(p['pnr'], safe=""),
+        logic=utils.pnr_status_logic, # Pulls the embedded JSON out of the HTML page
+        timeout=15.0, # Longer timeout as PNR status can be slow
+    ),
+}
 
-    except httpx.HTTPStatusError as e:
-        return JsonResponse({'success': False, 'error': f'HTTP error: {e.response.status_code} - {e.response.text}'}, status=e.response.status_code)
-    except httpx.RequestError as e:
-        return JsonResponse({'success': False, 'error': f'Request failed: {str(e)}'}, status=500)
-    except Exception as e:
-        print(f"Error in get_route_view: {e}")
-        return JsonResponse({'success': False, 'error': 'An unexpected error occurred.'}, status=500)
+async def get_train_view(request):
+    return await _dispatch(request, ENDPOINTS["train"])
 
+async def between_stations_view(request):
+    return await _dispatch(request, ENDPOINTS["between"])
 
-async def station_live_view(request):
-    station_code = request.GET.get('code')
-    if not station_code:
-        return JsonResponse({'success': False, 'error': 'code parameter (station code) is required'}, status=400)
+async def get_train_on_view(request):
+    return await _dispatch(request, ENDPOINTS["train_on"])
 
-    url_live = f"https://erail.in/station-live/{station_code}?DataSource=0&Language=0&Cache=true"
-    
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url_live, timeout=10.0)
-            response.raise_for_status()
-            html_data = response.text
-        
-        # Parse HTML using BeautifulSoup (equivalent to Cheerio)
-        soup = BeautifulSoup(html_data, 'html.parser')
-        
-        json_response_data = utils.live_station_logic(soup) # Pass the soup object
-        return JsonResponse(json_response_data) # Note: Express used resp.send()
+async def get_route_view(request):
+    return await _dispatch(request, ENDPOINTS["route"])
 
-    except httpx.HTTPStatusError as e:
-        return JsonResponse({'success': False, 'error': f'HTTP error: {e.response.status_code} - {e.response.text}'}, status=e.response.status_code)
-    except httpx.RequestError as e:
-        return JsonResponse({'success': False, 'error': f'Request failed: {str(e)}'}, status=500)
-    except Exception as e:
-        print(f"Error in station_live_view: {e}")
-        return JsonResponse({'success': False, 'error': 'An unexpected error occurred.'}, status=500)
+async def station_live_view(request):
+    return await _dispatch(request, ENDPOINTS["live"])
 
 async def pnr_status_view(request):
-    pnr_number = request.GET.get('pnr')
-    if not pnr_number:
-        return JsonResponse({'success': False, 'error': 'pnr parameter is required'}, status=400)
-
-    url_pnr = f"https://www.confirmtkt.com/pnr-status/{pnr_number}"
-    
-    try:
-        async with httpx.AsyncClient() as client:
-            # confirmtkt might be sensitive to user agents or require specific headers
-            # For now, a standard request:
-            response = await client.get(url_pnr, timeout=15.0) # Longer timeout as PNR status can be slow
-            response.raise_for_status()
-            data_text = response.text # This could be HTML or a JSON string in script tag
-
-        # The utils.pnr_status_logic will need to handle whether data_text is HTML to be parsed
-        # or if it's some other format.
-        json_response_data = utils.pnr_status_logic(data_text)
-        return JsonResponse(json_response_data) # Note: Express used resp.send()
-
-    except httpx.HTTPStatusError as e:
-        return JsonResponse({'success': False, 'error': f'HTTP error: {e.response.status_code} - {e.response.text}'}, status=e.response.status_code)
-    except httpx.RequestError as e:
-        return JsonResponse({'success': False, 'error': f'Request failed: {str(e)}'}, status=500)
-    except Exception as e:
-        print(f"Error in pnr_status_view: {e}")
-        return JsonResponse({'success': False, 'error': 'An unexpected error occurred.'}, status=500)
\ No newline at end of file
+    return await _dispatch(request, ENDPOINTS["pnr"])